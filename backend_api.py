@@ -3,21 +3,34 @@ Backend API for Audio Transcription and Note-Taking System
 FastAPI implementation - Python 3.13 Compatible Version
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 import os
-import json
-import uuid
+import asyncio
+import aiofiles
+import hashlib
+import logging
+import orjson
+import secrets
+import sqlite3
+import time
+from collections import OrderedDict
 from datetime import datetime
+from celery import Celery
 from dotenv import load_dotenv
+from redis import Redis
+from redis import asyncio as aioredis
 from supabase import create_client, Client
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
@@ -28,45 +41,107 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 security = HTTPBearer()
 
+# Background job queue for long-running ASR work
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Broker only: progress and results are published via the status hash, not task results
+celery_app = Celery("asr", broker=REDIS_URL)
+celery_app.conf.update(
+    task_ignore_result=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+# Processing status lives in Redis hashes (status:{file_id}) so it survives restarts
+# and is shared by every API worker and the Celery worker
+redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+worker_redis = Redis.from_url(REDIS_URL, decode_responses=True)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Audio Transcription API",
     description="Backend API for managing audio transcription and note summarization",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS for frontend integration
+# Configure CORS for frontend integration; an explicit whitelist instead of "*"
+# (wildcard plus credentials forces the Origin header to be echoed per request).
+# In production CORS can be terminated at the reverse proxy instead.
+CORS_ORIGINS = [
+    origin for origin in ("http://localhost:3000", "http://localhost:8501", os.getenv("FRONTEND_ORIGIN"))
+    if origin
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (note documents, listings) on the fly
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Data storage directories
 UPLOAD_DIR = "uploads"
 TRANSCRIPTS_DIR = "transcripts"
 SUMMARIES_DIR = "summaries"
 NOTES_DIR = "notes"
+STORE_DB = "store.db"
+
+# Fixed path templates, bound once at import instead of os.path.join per request
+_upload_path = (UPLOAD_DIR + "/{}{}").format
+_transcript_path = (TRANSCRIPTS_DIR + "/{}.json").format
+_summary_path = (SUMMARIES_DIR + "/{}.json").format
+
+# Uploads are streamed to disk in chunks of this size (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Max legacy note files held open at once during the startup import
+LEGACY_IMPORT_CONCURRENCY = 32
 
 # Create directories if they don't exist
 for directory in [UPLOAD_DIR, TRANSCRIPTS_DIR, SUMMARIES_DIR, NOTES_DIR]:
     os.makedirs(directory, exist_ok=True)
 
-# In-memory storage for demo purposes
-processing_status = {}
+# Derived values cached at write time so save_notes needn't re-parse
+# transcript_id -> {user_id, transcript_length}, summary_id -> {user_id, summary_points}
+# Each map keeps only the most recently used META_CACHE_SIZE entries
+META_CACHE_SIZE = 1024
+transcript_meta: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+summary_meta: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Saved notes live in SQLite (WAL mode); the body column holds the orjson-encoded document
+db = sqlite3.connect(STORE_DB, isolation_level=None, check_same_thread=False)
+db.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    CREATE TABLE IF NOT EXISTS notes(
+        id TEXT PRIMARY KEY,
+        user_id TEXT,
+        created_at TEXT,
+        has_user_notes INT,
+        body BLOB
+    );
+    CREATE INDEX IF NOT EXISTS notes_user_id ON notes(user_id, id);
+""")
 
 # Pydantic models for request/response validation
-class TranscribeRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies: reject unknown fields up front"""
+    model_config = ConfigDict(extra="forbid")
+
+class TranscribeRequest(RequestModel):
     audio_file_id: str
     language: Optional[str] = "en"
 
-class SummarizeRequest(BaseModel):
+class SummarizeRequest(RequestModel):
     transcript_id: str
     summary_type: Optional[str] = "standard"
 
-class SaveNotesRequest(BaseModel):
+class SaveNotesRequest(RequestModel):
     transcript_id: str
     summary_id: str
     user_notes: Optional[str] = ""
@@ -77,12 +152,12 @@ class APIResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-class SignUpRequest(BaseModel):
+class SignUpRequest(RequestModel):
     name: str
     email: str
     password: str
 
-class LoginRequest(BaseModel):
+class LoginRequest(RequestModel):
     email: str
     password: str
 
@@ -98,13 +173,75 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 
 # Utility functions
+def make_json_response(data: Dict[str, Any], status: int = 200) -> Response:
+    """Serialize once with orjson, bypassing jsonable_encoder"""
+    return Response(content=orjson.dumps(data), media_type="application/json", status_code=status)
+
+def make_raw_json_response(message: str, data: bytes, status: int = 200) -> Response:
+    """Wrap already-serialized JSON bytes in the standard success envelope"""
+    head = orjson.dumps({"success": True, "message": message})
+    return Response(content=head[:-1] + b',"data":' + data + b'}', media_type="application/json", status_code=status)
+
+def _transcript_meta(transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the fields save_notes needs from a transcript document"""
+    return {
+        "user_id": transcript_data.get("user_id"),
+        "transcript_length": len(transcript_data.get("transcript_text", ""))
+    }
+
+def _summary_meta(summary_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the fields save_notes needs from a summary document"""
+    return {
+        "user_id": summary_data.get("user_id"),
+        "summary_points": len(summary_data.get("key_points", []))
+    }
+
+def _remember_meta(cache: "OrderedDict[str, Dict[str, Any]]", key: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Store meta as the newest entry, evicting the oldest beyond META_CACHE_SIZE"""
+    cache[key] = meta
+    cache.move_to_end(key)
+    if len(cache) > META_CACHE_SIZE:
+        cache.popitem(last=False)
+    return meta
+
+def _cached_transcript_meta(transcript_id: str, transcript_bytes: bytes) -> Dict[str, Any]:
+    """Return cached transcript metadata, parsing the document only on a miss
+
+    Misses happen after a restart, after eviction and for transcripts written by the Celery worker.
+    """
+    meta = transcript_meta.get(transcript_id)
+    if meta is None:
+        return _remember_meta(transcript_meta, transcript_id, _transcript_meta(orjson.loads(transcript_bytes)))
+    transcript_meta.move_to_end(transcript_id)
+    return meta
+
+def _cached_summary_meta(summary_id: str, summary_bytes: bytes) -> Dict[str, Any]:
+    """Return cached summary metadata, parsing the document only on a miss"""
+    meta = summary_meta.get(summary_id)
+    if meta is None:
+        return _remember_meta(summary_meta, summary_id, _summary_meta(orjson.loads(summary_bytes)))
+    summary_meta.move_to_end(summary_id)
+    return meta
+
+def _status_key(file_id: str) -> str:
+    """Redis key of the processing status hash for an uploaded file"""
+    return f"status:{file_id}"
+
+_STATUS_INT_FIELDS = ("file_size", "transcript_length")
+
+def _decode_status(status: Dict[str, str]) -> Dict[str, Any]:
+    """Restore the numeric fields Redis hands back as strings"""
+    return {k: int(v) if k in _STATUS_INT_FIELDS else v for k, v in status.items()}
+
 def generate_id():
-    """Generate unique ID for resources"""
-    return str(uuid.uuid4())
+    """Generate a unique, time-ordered ID for resources (ns timestamp + 64 random bits)"""
+    return f"{time.time_ns():016x}{secrets.token_hex(8)}"
+
+_now = datetime.now
 
 def get_timestamp():
     """Get current timestamp"""
-    return datetime.now().isoformat()
+    return _now().isoformat()
 
 def simulate_asr_processing(audio_file_id: str) -> Dict[str, Any]:
     """Simulate ASR (Automatic Speech Recognition) processing"""
@@ -138,6 +275,90 @@ def simulate_nlp_processing(transcript_text: str) -> Dict[str, Any]:
     }
 
 
+@celery_app.task(bind=True, max_retries=3)
+def transcribe_task(self, audio_file_id: str, user_id: str) -> Dict[str, Any]:
+    """Run ASR for an uploaded file and store the transcript (executes in a Celery worker)"""
+    try:
+        asr_output = simulate_asr_processing(audio_file_id)
+        asr_output["user_id"] = user_id
+
+        transcript_file = _transcript_path(asr_output['transcript_id'])
+        with open(transcript_file, 'wb') as f:
+            f.write(orjson.dumps(asr_output))
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            worker_redis.hset(_status_key(audio_file_id), mapping={"status": "failed", "error": str(exc)})
+            raise
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+    result = {
+        "transcript_id": asr_output["transcript_id"],
+        "transcript_length": len(asr_output["transcript_text"])
+    }
+    worker_redis.hset(_status_key(audio_file_id), mapping={"status": "transcribed", **result})
+    return result
+
+
+@app.on_event("startup")
+async def import_legacy_notes():
+    """Copy notes saved as JSON files by older versions into the notes table"""
+    known = {row[0] for row in db.execute("SELECT id FROM notes")}
+    with os.scandir(NOTES_DIR) as it:
+        pending = [
+            e for e in it
+            if e.is_file() and e.name.endswith('.json') and e.name[:-len('.json')] not in known
+        ]
+    if not pending:
+        return
+
+    limit = asyncio.Semaphore(LEGACY_IMPORT_CONCURRENCY)
+
+    async def read_body(path: str) -> bytes:
+        async with limit:
+            async with aiofiles.open(path, 'rb') as f:
+                return await f.read()
+
+    bodies = await asyncio.gather(*(read_body(e.path) for e in pending), return_exceptions=True)
+
+    rows = []
+    for entry, body in zip(pending, bodies):
+        # A bad legacy file is skipped rather than blocking startup
+        try:
+            if isinstance(body, BaseException):
+                raise body
+            note_data = orjson.loads(body)
+            rows.append((
+                entry.name[:-len('.json')],
+                note_data.get("user_id"),
+                note_data["created_at"],
+                bool(note_data.get("user_notes")),
+                body
+            ))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Skipping legacy note %s: %r", entry.path, e)
+    if not rows:
+        return
+
+    # Every uvicorn worker runs this at startup against the same file: take the write
+    # lock up front (waiting out the busy timeout) and let INSERT OR IGNORE make the
+    # repeat imports no-ops. If another worker holds the lock too long, leave it to them.
+    try:
+        db.execute("BEGIN IMMEDIATE")
+    except sqlite3.OperationalError as e:
+        logger.warning("Skipping legacy note import, database busy: %s", e)
+        return
+    try:
+        db.executemany(
+            "INSERT OR IGNORE INTO notes(id, user_id, created_at, has_user_notes, body) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+    except Exception:
+        # Never leave the shared autocommit connection inside an open transaction
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
 # API Endpoints
 
 @app.get("/")
@@ -153,6 +374,8 @@ def root():
             "auth_logout": "/auth/logout",
             "upload": "/upload-audio",
             "transcribe": "/transcribe",
+            "transcript": "/transcripts/{transcript_id}",
+            "status": "/status/{file_id}",
             "summarize": "/summarize",
             "save": "/save-notes",
             "retrieve": "/notes/{note_id}"
@@ -171,30 +394,21 @@ def auth_signup(request: SignUpRequest):
         })
 
         if response.user is None:
-            return JSONResponse(
-                status_code=400,
-                content={"success": False, "message": "Sign-up failed", "error": "Could not create user"},
-            )
+            return make_json_response({"success": False, "message": "Sign-up failed", "error": "Could not create user"}, status=400)
 
         session = response.session
-        return JSONResponse(
-            status_code=201,
-            content={
-                "success": True,
-                "message": "User registered successfully",
-                "data": {
-                    "user_id": response.user.id,
-                    "email": response.user.email,
-                    "name": request.name,
-                    "access_token": session.access_token if session else None,
-                },
+        return make_json_response({
+            "success": True,
+            "message": "User registered successfully",
+            "data": {
+                "user_id": response.user.id,
+                "email": response.user.email,
+                "name": request.name,
+                "access_token": session.access_token if session else None,
             },
-        )
+        }, status=201)
     except Exception as e:
-        return JSONResponse(
-            status_code=400,
-            content={"success": False, "message": "Sign-up failed", "error": str(e)},
-        )
+        return make_json_response({"success": False, "message": "Sign-up failed", "error": str(e)}, status=400)
 
 
 @app.post("/auth/login")
@@ -206,24 +420,18 @@ def auth_login(request: LoginRequest):
             "password": request.password,
         })
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Login successful",
-                "data": {
-                    "user_id": response.user.id,
-                    "email": response.user.email,
-                    "name": response.user.user_metadata.get("name", ""),
-                    "access_token": response.session.access_token,
-                },
+        return make_json_response({
+            "success": True,
+            "message": "Login successful",
+            "data": {
+                "user_id": response.user.id,
+                "email": response.user.email,
+                "name": response.user.user_metadata.get("name", ""),
+                "access_token": response.session.access_token,
             },
-        )
+        })
     except Exception as e:
-        return JSONResponse(
-            status_code=401,
-            content={"success": False, "message": "Login failed", "error": str(e)},
-        )
+        return make_json_response({"success": False, "message": "Login failed", "error": str(e)}, status=401)
 
 
 @app.post("/auth/logout")
@@ -231,19 +439,13 @@ def auth_logout(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Log out the current user."""
     try:
         supabase.auth.sign_out()
-        return JSONResponse(
-            status_code=200,
-            content={"success": True, "message": "Logged out successfully"},
-        )
+        return make_json_response({"success": True, "message": "Logged out successfully"})
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={"success": False, "message": "Logout failed", "error": str(e)},
-        )
+        return make_json_response({"success": False, "message": "Logout failed", "error": str(e)}, status=500)
 
 
 @app.post("/upload-audio")
-def upload_audio(file: UploadFile = File(...), current_user: Dict[str, Any] = Depends(get_current_user)):
+async def upload_audio(file: UploadFile = File(...), current_user: Dict[str, Any] = Depends(get_current_user)):
     """Accept audio file upload from frontend"""
     try:
         allowed_extensions = ['.mp3', '.wav', '.m4a', '.ogg', '.flac']
@@ -256,100 +458,121 @@ def upload_audio(file: UploadFile = File(...), current_user: Dict[str, Any] = De
             )
 
         file_id = generate_id()
-        file_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_ext}")
+        file_path = _upload_path(file_id, file_ext)
 
-        content = file.file.read()
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        file_size = 0
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                await f.write(chunk)
 
-        processing_status[file_id] = {
+        upload_timestamp = get_timestamp()
+        await redis_client.hset(_status_key(file_id), mapping={
             "user_id": current_user["id"],
             "status": "uploaded",
             "filename": file.filename,
-            "file_size": len(content),
-            "upload_timestamp": get_timestamp()
-        }
+            "file_size": file_size,
+            "upload_timestamp": upload_timestamp
+        })
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Audio file uploaded successfully",
-                "data": {
-                    "file_id": file_id,
-                    "filename": file.filename,
-                    "file_size_bytes": len(content),
-                    "format": file_ext,
-                    "upload_timestamp": get_timestamp()
-                }
+        return make_json_response({
+            "success": True,
+            "message": "Audio file uploaded successfully",
+            "data": {
+                "file_id": file_id,
+                "filename": file.filename,
+                "file_size_bytes": file_size,
+                "format": file_ext,
+                "upload_timestamp": upload_timestamp
             }
-        )
+        })
 
     except HTTPException:
         raise
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to upload audio file",
-                "error": str(e)
-            }
-        )
+        return make_json_response({
+            "success": False,
+            "message": "Failed to upload audio file",
+            "error": str(e)
+        }, status=500)
 
 @app.post("/transcribe")
-def transcribe_audio(request: TranscribeRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
-    """Send audio to ASR module for transcription"""
+async def transcribe_audio(request: TranscribeRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
+    """Queue audio for ASR transcription; poll /status/{file_id} for the result"""
     try:
-        if request.audio_file_id not in processing_status:
+        status_key = _status_key(request.audio_file_id)
+        owner = await redis_client.hget(status_key, "user_id")
+
+        if owner is None:
             raise HTTPException(status_code=404, detail="Audio file not found. Please upload the file first.")
 
-        if processing_status[request.audio_file_id].get("user_id") != current_user["id"]:
+        if owner != current_user["id"]:
             raise HTTPException(status_code=403, detail="Access denied")
 
-        asr_output = simulate_asr_processing(request.audio_file_id)
-        asr_output["user_id"] = current_user["id"]
+        # Mark as queued before enqueueing so a fast worker's update can't be overwritten
+        await redis_client.hset(status_key, "status", "queued")
+        # Publishing to the broker blocks, so keep it off the event loop
+        try:
+            task = await asyncio.to_thread(transcribe_task.delay, request.audio_file_id, current_user["id"])
+        except Exception as exc:
+            # Nothing was queued; fail the status so pollers stop waiting
+            await redis_client.hset(status_key, mapping={"status": "failed", "error": str(exc)})
+            raise
+        await redis_client.hset(status_key, "task_id", task.id)
+
+        return make_json_response({
+            "success": True,
+            "message": "Transcription queued",
+            "data": {
+                "file_id": request.audio_file_id,
+                "status": "queued",
+                "task_id": task.id
+            }
+        }, status=202)
 
-        transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{asr_output['transcript_id']}.json")
-        with open(transcript_file, 'w') as f:
-            json.dump(asr_output, f, indent=2)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return make_json_response({
+            "success": False,
+            "message": "Transcription failed",
+            "error": str(e)
+        }, status=500)
 
-        processing_status[request.audio_file_id]["status"] = "transcribed"
-        processing_status[request.audio_file_id]["transcript_id"] = asr_output["transcript_id"]
+@app.get("/transcripts/{transcript_id}")
+async def get_transcript(transcript_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
+    """Retrieve a finished transcript by ID"""
+    try:
+        try:
+            async with aiofiles.open(_transcript_path(transcript_id), 'rb') as f:
+                transcript_bytes = await f.read()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Transcript not found")
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Audio transcribed successfully",
-                "data": asr_output
-            }
-        )
+        if _cached_transcript_meta(transcript_id, transcript_bytes)["user_id"] != current_user["id"]:
+            raise HTTPException(status_code=403, detail="Access denied")
+
+        return make_raw_json_response("Transcript retrieved successfully", transcript_bytes)
 
     except HTTPException:
         raise
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Transcription failed",
-                "error": str(e)
-            }
-        )
+        return make_json_response({
+            "success": False,
+            "message": "Failed to retrieve transcript",
+            "error": str(e)
+        }, status=500)
 
 @app.post("/summarize")
-def summarize_transcript(request: SummarizeRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
+async def summarize_transcript(request: SummarizeRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
     """Send transcript to NLP module for summarization"""
     try:
-        transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{request.transcript_id}.json")
-
-        if not os.path.exists(transcript_file):
+        try:
+            async with aiofiles.open(_transcript_path(request.transcript_id), 'rb') as f:
+                transcript_data = orjson.loads(await f.read())
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Transcript not found. Please transcribe the audio first.")
 
-        with open(transcript_file, 'r') as f:
-            transcript_data = json.load(f)
-
         if transcript_data.get("user_id") != current_user["id"]:
             raise HTTPException(status_code=403, detail="Access denied")
 
@@ -357,47 +580,42 @@ def summarize_transcript(request: SummarizeRequest, current_user: Dict[str, Any]
         nlp_output["transcript_id"] = request.transcript_id
         nlp_output["user_id"] = current_user["id"]
 
-        summary_file = os.path.join(SUMMARIES_DIR, f"{nlp_output['summary_id']}.json")
-        with open(summary_file, 'w') as f:
-            json.dump(nlp_output, f, indent=2)
+        summary_file = _summary_path(nlp_output['summary_id'])
+        nlp_bytes = orjson.dumps(nlp_output)
+        async with aiofiles.open(summary_file, 'wb') as f:
+            await f.write(nlp_bytes)
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Transcript summarized successfully",
-                "data": nlp_output
-            }
-        )
+        _remember_meta(summary_meta, nlp_output["summary_id"], _summary_meta(nlp_output))
+
+        return make_raw_json_response("Transcript summarized successfully", nlp_bytes)
 
     except HTTPException:
         raise
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Summarization failed",
-                "error": str(e)
-            }
-        )
+        return make_json_response({
+            "success": False,
+            "message": "Summarization failed",
+            "error": str(e)
+        }, status=500)
 
 @app.post("/save-notes")
-def save_notes(request: SaveNotesRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
+async def save_notes(request: SaveNotesRequest, current_user: Dict[str, Any] = Depends(get_current_user)):
     """Store final processed output and summarized notes"""
     try:
-        transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{request.transcript_id}.json")
-        with open(transcript_file, 'r') as f:
-            transcript_data = json.load(f)
+        transcript_file = _transcript_path(request.transcript_id)
+        async with aiofiles.open(transcript_file, 'rb') as f:
+            transcript_bytes = await f.read()
 
-        if transcript_data.get("user_id") != current_user["id"]:
+        t_meta = _cached_transcript_meta(request.transcript_id, transcript_bytes)
+        if t_meta["user_id"] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Access denied")
 
-        summary_file = os.path.join(SUMMARIES_DIR, f"{request.summary_id}.json")
-        with open(summary_file, 'r') as f:
-            summary_data = json.load(f)
+        summary_file = _summary_path(request.summary_id)
+        async with aiofiles.open(summary_file, 'rb') as f:
+            summary_bytes = await f.read()
 
-        if summary_data.get("user_id") != current_user["id"]:
+        s_meta = _cached_summary_meta(request.summary_id, summary_bytes)
+        if s_meta["user_id"] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Access denied")
 
         note_id = generate_id()
@@ -407,161 +625,161 @@ def save_notes(request: SaveNotesRequest, current_user: Dict[str, Any] = Depends
             "transcript_id": request.transcript_id,
             "summary_id": request.summary_id,
             "created_at": get_timestamp(),
-            "transcript": transcript_data,
-            "summary": summary_data,
             "user_notes": request.user_notes,
             "status": "saved"
         }
 
-        notes_file = os.path.join(NOTES_DIR, f"{note_id}.json")
-        with open(notes_file, 'w') as f:
-            json.dump(notes_document, f, indent=2)
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Notes saved successfully",
-                "data": {
-                    "note_id": note_id,
-                    "created_at": notes_document["created_at"],
-                    "transcript_length": len(transcript_data.get("transcript_text", "")),
-                    "summary_points": len(summary_data.get("key_points", [])),
-                    "has_user_notes": bool(request.user_notes)
-                }
-            }
+        # Splice the stored transcript/summary bytes in as-is instead of re-encoding them
+        head = orjson.dumps(notes_document)
+        notes_bytes = head[:-1] + b',"transcript":' + transcript_bytes + b',"summary":' + summary_bytes + b'}'
+
+        db.execute(
+            "INSERT INTO notes(id, user_id, created_at, has_user_notes, body) VALUES (?, ?, ?, ?, ?)",
+            (note_id, current_user["id"], notes_document["created_at"], bool(request.user_notes), notes_bytes)
         )
 
+        return make_json_response({
+            "success": True,
+            "message": "Notes saved successfully",
+            "data": {
+                "note_id": note_id,
+                "created_at": notes_document["created_at"],
+                "transcript_length": t_meta["transcript_length"],
+                "summary_points": s_meta["summary_points"],
+                "has_user_notes": bool(request.user_notes)
+            }
+        })
+
     except HTTPException:
         raise
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to save notes",
-                "error": str(e)
-            }
-        )
+        return make_json_response({
+            "success": False,
+            "message": "Failed to save notes",
+            "error": str(e)
+        }, status=500)
 
 @app.get("/notes/{note_id}")
-def get_notes(note_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_notes(note_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
     """Retrieve saved notes by ID"""
     try:
-        notes_file = os.path.join(NOTES_DIR, f"{note_id}.json")
+        row = db.execute("SELECT user_id, body FROM notes WHERE id = ?", (note_id,)).fetchone()
 
-        if not os.path.exists(notes_file):
+        if row is None:
             raise HTTPException(status_code=404, detail="Notes not found")
 
-        with open(notes_file, 'r') as f:
-            notes_data = json.load(f)
-
-        if notes_data.get("user_id") != current_user["id"]:
+        if row[0] != current_user["id"]:
             raise HTTPException(status_code=403, detail="Access denied")
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Notes retrieved successfully",
-                "data": notes_data
-            }
-        )
+        return make_raw_json_response("Notes retrieved successfully", row[1])
 
     except HTTPException:
         raise
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to retrieve notes",
-                "error": str(e)
-            }
-        )
+        return make_json_response({
+            "success": False,
+            "message": "Failed to retrieve notes",
+            "error": str(e)
+        }, status=500)
+
+@app.get("/debug/notes/{note_id}")
+async def get_notes_pretty(note_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
+    """Retrieve saved notes re-indented for reading; stored documents are compact"""
+    row = db.execute("SELECT user_id, body FROM notes WHERE id = ?", (note_id,)).fetchone()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="Notes not found")
+
+    if row[0] != current_user["id"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return Response(
+        content=orjson.dumps(orjson.loads(row[1]), option=orjson.OPT_INDENT_2),
+        media_type="application/json"
+    )
 
 @app.get("/notes")
-def list_all_notes(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def list_all_notes(current_user: Dict[str, Any] = Depends(get_current_user)):
     """List all saved notes for the current user"""
     try:
-        notes_list = []
-
-        for filename in os.listdir(NOTES_DIR):
-            if filename.endswith('.json'):
-                file_path = os.path.join(NOTES_DIR, filename)
-                with open(file_path, 'r') as f:
-                    note_data = json.load(f)
-                    if note_data.get("user_id") != current_user["id"]:
-                        continue
-                    notes_list.append({
-                        "note_id": note_data["note_id"],
-                        "created_at": note_data["created_at"],
-                        "has_user_notes": bool(note_data.get("user_notes"))
-                    })
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": f"Found {len(notes_list)} notes",
-                "data": {
-                    "count": len(notes_list),
-                    "notes": notes_list
-                }
-            }
+        # IDs are time-ordered, so ordering by id lists notes chronologically
+        rows = db.execute(
+            "SELECT id, created_at, has_user_notes FROM notes WHERE user_id = ? ORDER BY id",
+            (current_user["id"],)
         )
+        notes_list = [
+            {"note_id": note_id, "created_at": created_at, "has_user_notes": bool(has_user_notes)}
+            for note_id, created_at, has_user_notes in rows
+        ]
 
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to list notes",
-                "error": str(e)
+        return make_json_response({
+            "success": True,
+            "message": f"Found {len(notes_list)} notes",
+            "data": {
+                "count": len(notes_list),
+                "notes": notes_list
             }
-        )
+        })
+
+    except Exception as e:
+        return make_json_response({
+            "success": False,
+            "message": "Failed to list notes",
+            "error": str(e)
+        }, status=500)
 
 @app.get("/status/{file_id}")
-def get_processing_status(file_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
-    """Check processing status of an uploaded file"""
-    if file_id not in processing_status:
+async def get_processing_status(file_id: str, request: Request, current_user: Dict[str, Any] = Depends(get_current_user)):
+    """Check processing status of an uploaded file (supports If-None-Match polling)"""
+    status = await redis_client.hgetall(_status_key(file_id))
+
+    if not status:
         raise HTTPException(status_code=404, detail="File not found")
 
-    if processing_status[file_id].get("user_id") != current_user["id"]:
+    if status.get("user_id") != current_user["id"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return JSONResponse(
-        status_code=200,
-        content={
-            "success": True,
-            "message": "Status retrieved successfully",
-            "data": processing_status[file_id]
-        }
-    )
+    # The ETag is derived from the stored hash itself, so every writer (API or
+    # Celery worker) bumps it implicitly and it can never go stale
+    status_bytes = orjson.dumps(_decode_status(status), option=orjson.OPT_SORT_KEYS)
+    etag = f'W/"{hashlib.blake2b(status_bytes, digest_size=8).hexdigest()}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response = make_raw_json_response("Status retrieved successfully", status_bytes)
+    response.headers["ETag"] = etag
+    return response
 
 # Error handlers
 @app.exception_handler(404)
 def not_found_handler(request, exc):
-    return JSONResponse(
-        status_code=404,
-        content={
-            "success": False,
-            "message": "Resource not found",
-            "error": str(exc.detail) if hasattr(exc, 'detail') else "Not found"
-        }
-    )
+    return make_json_response({
+        "success": False,
+        "message": "Resource not found",
+        "error": str(exc.detail) if hasattr(exc, 'detail') else "Not found"
+    }, status=404)
 
 @app.exception_handler(500)
 def internal_error_handler(request, exc):
-    return JSONResponse(
-        status_code=500,
-        content={
-            "success": False,
-            "message": "Internal server error",
-            "error": "An unexpected error occurred"
-        }
-    )
+    return make_json_response({
+        "success": False,
+        "message": "Internal server error",
+        "error": "An unexpected error occurred"
+    }, status=500)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+
+    # Hot reload only in development; it needs a single worker and costs throughput
+    dev_mode = os.getenv("ENV") == "dev"
+    uvicorn.run(
+        "backend_api:app",
+        host="0.0.0.0",
+        port=8000,
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard] skips uvloop on Windows)
+        loop="auto",
+        http="auto",
+        workers=1 if dev_mode else os.cpu_count(),
+        reload=dev_mode
+    )
@@ -4,8 +4,15 @@ Streamlit implementation with intuitive UI
 """
 
 import streamlit as st
+import asyncio
+import httpx
+import ijson
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
 import json
+import re
 import time
 from datetime import datetime
 from io import BytesIO
@@ -22,8 +29,38 @@ st.set_page_config(
 # API Configuration
 API_BASE_URL = "http://localhost:8000"
 
-# Custom CSS for better styling
-st.markdown("""
+# (connect, read) timeout for the slow processing endpoints
+LONG_REQUEST_TIMEOUT = (3, 300)
+
+@st.cache_resource
+def _get_session():
+    """Create one pooled HTTP session per server process, reused across reruns"""
+    session = requests.Session()
+    # Retry transient gateway errors on GETs only: the POSTs aren't idempotent
+    # (re-running /summarize or /save-notes duplicates work) and a streamed upload
+    # body can't be rewound. Pool sized for the concurrent note fetches.
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    session.mount("http://", HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=16))
+    return session
+
+SESSION = _get_session()
+
+# Transcription runs as a background job; poll its status at this pace
+TRANSCRIBE_POLL_INTERVAL = 1
+TRANSCRIBE_TIMEOUT = 600
+# (connect, read) timeout for each status/transcript poll, so a stalled backend
+# can't block past the TRANSCRIBE_TIMEOUT deadline
+POLL_REQUEST_TIMEOUT = (3, 10)
+
+# Custom CSS for better styling. It has to be emitted on every run: Streamlit
+# drops any element the current script run doesn't re-send, styles included.
+CUSTOM_CSS = """
     <style>
     .main {
         padding-top: 2rem;
@@ -81,10 +118,11 @@ st.markdown("""
         margin: 1rem 0;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-for key, default in {
+SESSION_DEFAULTS = {
     "access_token": None,
     "user_info": None,
     "file_id": None,
@@ -94,9 +132,10 @@ for key, default in {
     "transcript_data": None,
     "summary_data": None,
     "processing_stage": "upload",
-}.items():
-    if key not in st.session_state:
-        st.session_state[key] = default
+    "notes_version": 0,
+}
+for key, default in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, default)
 
 
 def _auth_headers():
@@ -107,10 +146,12 @@ def _auth_headers():
     return {}
 
 # Helper functions
+@st.cache_data(ttl=5, show_spinner=False)
 def check_api_health():
-    """Check if API is running"""
+    """Check if API is running (cached briefly so reruns don't re-probe)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/", timeout=5)
+        # Plain request, not SESSION: a down backend should fail fast, without retries
+        response = requests.get(f"{API_BASE_URL}/", timeout=1)
         return response.status_code == 200
     except:
         return False
@@ -118,7 +159,7 @@ def check_api_health():
 def signup_user(name, email, password):
     """Register a new user via the backend."""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/auth/signup",
             json={"name": name, "email": email, "password": password},
         )
@@ -129,7 +170,7 @@ def signup_user(name, email, password):
 def login_user(email, password):
     """Authenticate a user via the backend."""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/auth/login",
             json={"email": email, "password": password},
         )
@@ -140,7 +181,7 @@ def login_user(email, password):
 def logout_user():
     """Log out the current user via the backend."""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/auth/logout",
             headers=_auth_headers(),
         )
@@ -149,33 +190,70 @@ def logout_user():
         return {"success": False, "error": str(e)}
 
 def upload_audio_file(file):
-    """Upload audio file to backend"""
+    """Upload audio file to backend, streaming the multipart body from the file handle"""
     try:
-        files = {'file': (file.name, file, file.type)}
-        response = requests.post(f"{API_BASE_URL}/upload-audio", files=files, headers=_auth_headers())
+        file.seek(0)
+        encoder = MultipartEncoder(fields={'file': (file.name, file, file.type)})
+        headers = {**_auth_headers(), "Content-Type": encoder.content_type}
+        response = SESSION.post(f"{API_BASE_URL}/upload-audio", data=encoder, headers=headers)
         return response.json()
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 def transcribe_audio(file_id):
-    """Request transcription of uploaded audio"""
+    """Queue transcription of uploaded audio and wait for the finished transcript"""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/transcribe",
             json={"audio_file_id": file_id},
             headers=_auth_headers(),
+            timeout=LONG_REQUEST_TIMEOUT,
         )
-        return response.json()
+        result = response.json()
+        if not result.get("success"):
+            return result
+
+        deadline = time.monotonic() + TRANSCRIBE_TIMEOUT
+        etag = None
+        while time.monotonic() < deadline:
+            headers = _auth_headers()
+            if etag:
+                headers["If-None-Match"] = etag
+            response = SESSION.get(f"{API_BASE_URL}/status/{file_id}", headers=headers, timeout=POLL_REQUEST_TIMEOUT)
+            if response.status_code == 304:
+                time.sleep(TRANSCRIBE_POLL_INTERVAL)
+                continue
+
+            status = response.json()
+            if not status.get("success"):
+                return status
+            etag = response.headers.get("ETag")
+
+            state = status["data"]["status"]
+            if state == "transcribed":
+                response = SESSION.get(
+                    f"{API_BASE_URL}/transcripts/{status['data']['transcript_id']}",
+                    headers=_auth_headers(),
+                    timeout=POLL_REQUEST_TIMEOUT,
+                )
+                return response.json()
+            if state == "failed":
+                return {"success": False, "error": status["data"].get("error", "Transcription job failed")}
+
+            time.sleep(TRANSCRIBE_POLL_INTERVAL)
+
+        return {"success": False, "error": "Timed out waiting for transcription"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 def summarize_transcript(transcript_id):
     """Request summarization of transcript"""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/summarize",
             json={"transcript_id": transcript_id},
             headers=_auth_headers(),
+            timeout=LONG_REQUEST_TIMEOUT,
         )
         return response.json()
     except Exception as e:
@@ -184,7 +262,7 @@ def summarize_transcript(transcript_id):
 def save_notes(transcript_id, summary_id, user_notes=""):
     """Save final notes"""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/save-notes",
             json={
                 "transcript_id": transcript_id,
@@ -197,25 +275,75 @@ def save_notes(transcript_id, summary_id, user_notes=""):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def get_saved_notes(note_id):
-    """Retrieve saved notes"""
+def _note_result(response):
+    """Turn one note response (or the exception raised fetching it) into a result dict"""
+    if isinstance(response, Exception):
+        return {"success": False, "error": str(response)}
     try:
-        response = requests.get(f"{API_BASE_URL}/notes/{note_id}", headers=_auth_headers())
-        return response.json()
+        result = response.json()
+    except ValueError:
+        result = {}
+    if response.is_success:
+        return result
+    return {"success": False, "error": result.get("error") or result.get("detail") or f"HTTP {response.status_code}"}
+
+async def _fetch_notes_concurrently(note_ids, headers):
+    """GET every note in parallel over one async client; each note succeeds or fails on its own"""
+    async with httpx.AsyncClient(base_url=API_BASE_URL, headers=headers, timeout=30) as client:
+        responses = await asyncio.gather(
+            *(client.get(f"/notes/{note_id}") for note_id in note_ids),
+            return_exceptions=True
+        )
+    return {note_id: _note_result(response) for note_id, response in zip(note_ids, responses)}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_notes_cached(note_ids, token):
+    """Memoize note details per (note IDs, user); saved notes never change
+
+    Only successful results are kept, so failed notes are fetched again on the next run.
+    """
+    results = asyncio.run(_fetch_notes_concurrently(note_ids, {"Authorization": f"Bearer {token}"}))
+    return {note_id: result for note_id, result in results.items() if result.get("success")}
+
+def get_saved_notes_batch(note_ids):
+    """Retrieve several saved notes at once, keyed by note_id"""
+    token = st.session_state.access_token
+    try:
+        results = dict(_fetch_notes_cached(tuple(note_ids), token))
+        missing = [note_id for note_id in note_ids if note_id not in results]
+        if missing:
+            results.update(asyncio.run(_fetch_notes_concurrently(missing, {"Authorization": f"Bearer {token}"})))
+        return results
     except Exception as e:
-        return {"success": False, "error": str(e)}
+        return {note_id: {"success": False, "error": str(e)} for note_id in note_ids}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_notes_list(version, token):
+    """Memoize the notes listing per user until it is refreshed (version bump) or expires"""
+    with SESSION.get(f"{API_BASE_URL}/notes", headers={"Authorization": f"Bearer {token}"}, stream=True) as response:
+        # Raise on an error status so the failure isn't memoized for this version
+        response.raise_for_status()
+        # Parse the list incrementally off the socket; let urllib3 undo the gzip encoding
+        response.raw.decode_content = True
+        notes = list(ijson.items(response.raw, "data.notes.item"))
+    return {"success": True, "data": {"count": len(notes), "notes": notes}}
 
 def list_all_notes():
     """List all saved notes"""
     try:
-        response = requests.get(f"{API_BASE_URL}/notes", headers=_auth_headers())
-        return response.json()
+        return _cached_notes_list(st.session_state.notes_version, st.session_state.access_token)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def transcript_stats(transcript_id, _transcript_text):
+    """Derived transcript values, computed once per transcript_id (the text itself isn't hashed)"""
+    return {"words": len(_transcript_text.split()), "lower": _transcript_text.lower()}
+
 def export_to_text(transcript_text, summary_text, key_points):
     """Export notes as plain text"""
-    text_content = f"""AUDIO TRANSCRIPTION NOTES
+    points_block = "".join(f"{i}. {point}\n" for i, point in enumerate(key_points, 1))
+    return f"""AUDIO TRANSCRIPTION NOTES
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'=' * 60}
 
@@ -229,11 +357,7 @@ SUMMARY
 
 KEY POINTS
 {'-' * 60}
-"""
-    for i, point in enumerate(key_points, 1):
-        text_content += f"{i}. {point}\n"
-    
-    return text_content
+{points_block}"""
 
 # Header
 st.title("🎙️ Audio Notes - Transcription & Summarization")
@@ -407,8 +531,7 @@ if page == "Upload & Process":
                         st.session_state.transcript_id = result["data"]["transcript_id"]
                         st.session_state.transcript_data = result["data"]
                         st.session_state.processing_stage = "summarize"
-                        st.success("✅ Transcription complete!")
-                        time.sleep(1)
+                        st.toast("✅ Transcription complete!")
                         st.rerun()
                     else:
                         st.error(f"❌ Transcription failed: {result.get('error', 'Unknown error')}")
@@ -421,6 +544,7 @@ if page == "Upload & Process":
         transcript_text = st.session_state.transcript_data.get("transcript_text", "")
         confidence = st.session_state.transcript_data.get("confidence", 0)
         duration = st.session_state.transcript_data.get("duration_seconds", 0)
+        stats = transcript_stats(st.session_state.transcript_id, transcript_text)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -428,20 +552,18 @@ if page == "Upload & Process":
         with col2:
             st.metric("Confidence", f"{confidence*100:.1f}%")
         with col3:
-            st.metric("Words", len(transcript_text.split()))
+            st.metric("Words", stats["words"])
         
         st.markdown(f'<div class="transcript-box">{transcript_text}</div>', unsafe_allow_html=True)
         
         # Search functionality
         search_term = st.text_input("🔍 Search in transcript", key="search_transcript")
         if search_term:
-            if search_term.lower() in transcript_text.lower():
+            if search_term.lower() in stats["lower"]:
                 st.success(f"Found '{search_term}' in transcript")
-                # Highlight search term (basic implementation)
-                highlighted = transcript_text.replace(
-                    search_term,
-                    f"**{search_term}**"
-                )
+                # Highlight every case-insensitive match
+                pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+                highlighted = pattern.sub(lambda m: f"**{m.group(0)}**", transcript_text)
                 st.markdown(highlighted)
             else:
                 st.warning(f"'{search_term}' not found in transcript")
@@ -459,8 +581,7 @@ if page == "Upload & Process":
                     st.session_state.summary_id = result["data"]["summary_id"]
                     st.session_state.summary_data = result["data"]
                     st.session_state.processing_stage = "save"
-                    st.success("✅ Summary generated!")
-                    time.sleep(1)
+                    st.toast("✅ Summary generated!")
                     st.rerun()
                 else:
                     st.error(f"❌ Summarization failed: {result.get('error', 'Unknown error')}")
@@ -509,6 +630,7 @@ if page == "Upload & Process":
                     
                     if result.get("success"):
                         st.session_state.note_id = result["data"]["note_id"]
+                        st.session_state.notes_version += 1
                         st.session_state.processing_stage = "complete"
                         st.success(f"✅ Notes saved! ID: {st.session_state.note_id}")
                         st.balloons()
@@ -541,6 +663,7 @@ elif page == "View Saved Notes":
     
     # Load all notes
     if st.button("🔄 Refresh Notes List"):
+        st.session_state.notes_version += 1
         st.rerun()
     
     result = list_all_notes()
@@ -551,13 +674,16 @@ elif page == "View Saved Notes":
         if notes_list:
             st.success(f"Found {len(notes_list)} saved note(s)")
             
+            # Fetch every note's details concurrently instead of one GET per click
+            note_details = get_saved_notes_batch([note['note_id'] for note in notes_list])
+            
             for note in notes_list:
-                with st.expander(f"📄 Note ID: {note['note_id'][:8]}... (Created: {note['created_at'][:19]})"):
+                with st.expander(f"📄 Note ID: {note['note_id']} (Created: {note['created_at'][:19]})"):
                     col1, col2 = st.columns([3, 1])
                     
                     with col1:
-                        if st.button(f"View Details", key=f"view_{note['note_id']}"):
-                            note_result = get_saved_notes(note['note_id'])
+                        if st.toggle("View Details", key=f"view_{note['note_id']}"):
+                            note_result = note_details[note['note_id']]
                             
                             if note_result.get("success"):
                                 note_data = note_result["data"]
@@ -585,6 +711,8 @@ elif page == "View Saved Notes":
                                         height=100,
                                         key=f"user_{note['note_id']}"
                                     )
+                            else:
+                                st.error(f"Failed to load note: {note_result.get('error', 'Unknown error')}")
                     
                     with col2:
                         st.metric("Has User Notes", "Yes" if note['has_user_notes'] else "No")
@@ -626,7 +754,7 @@ elif page == "API Documentation":
     #### 2. Transcribe Audio
     **Endpoint:** `POST /transcribe`
     
-    **Description:** Send audio to ASR module for transcription
+    **Description:** Queue audio for ASR transcription in a background worker
     
     **Request Body:**
     ```json
@@ -636,11 +764,25 @@ elif page == "API Documentation":
     }
     ```
     
-    **Response:**
+    **Response (202 Accepted):**
     ```json
     {
         "success": true,
-        "message": "Audio transcribed successfully",
+        "message": "Transcription queued",
+        "data": {
+            "file_id": "uuid",
+            "status": "queued",
+            "task_id": "uuid"
+        }
+    }
+    ```
+    
+    Poll `GET /status/{file_id}` until `status` is `transcribed`, then fetch
+    the transcript from `GET /transcripts/{transcript_id}`:
+    ```json
+    {
+        "success": true,
+        "message": "Transcript retrieved successfully",
         "data": {
             "transcript_id": "uuid",
             "transcript_text": "...",
@@ -749,6 +891,9 @@ elif page == "API Documentation":
     # Install dependencies
     pip install fastapi uvicorn aiofiles python-multipart
     
+    # Start Redis and the transcription worker
+    celery -A backend_api.celery_app worker
+    
     # Run the API
     python backend_api.py
     ```
@@ -2,17 +2,15 @@ from fastapi import APIRouter, HTTPException
 import uuid
 import requests
 import tempfile
-import whisper
 from datetime import datetime
 
 from project.backend.models.schemas import TranscribeRequest
+from project.backend.models.whisper_loader import get_whisper
 from project.backend.supabase_service import supabase
 from project.backend.services.metrics_service import update_metrics
 
 router = APIRouter()
 
-model = whisper.load_model("base")
-
 @router.post("/transcribe")
 def transcribe_audio(request: TranscribeRequest):
 
@@ -29,18 +27,18 @@ def transcribe_audio(request: TranscribeRequest):
         f.write(audio)
         temp_path = f.name
 
-    result = model.transcribe(temp_path)
+    segments, info = get_whisper("base").transcribe(temp_path, vad_filter=True)
+    text = "".join(s.text for s in segments)
 
     transcript_id = str(uuid.uuid4())
 
-    text = result["text"]
     word_count = len(text.split())
 
     supabase.table("transcripts").insert({
         "id": transcript_id,
         "upload_id": request.audio_file_id,
         "transcript_text": text,
-        "duration_seconds": result.get("duration", 0),
+        "duration_seconds": info.duration,
         "confidence": 0.9,
         "word_count": word_count,
         "created_at": datetime.utcnow().isoformat()
@@ -57,5 +55,5 @@ def transcribe_audio(request: TranscribeRequest):
     return {
         "success": True,
         "transcript_id": transcript_id,
-        "text": result["text"]
+        "text": text
     }
\ No newline at end of file
@@ -1,14 +1,17 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any, List
 
-class TranscribeRequest(BaseModel):
+class RequestModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+class TranscribeRequest(RequestModel):
     audio_file_id: str
     language: Optional[str] = "en"
 
-class SummarizeRequest(BaseModel):
+class SummarizeRequest(RequestModel):
     transcript_id: str
 
-class SaveNotesRequest(BaseModel):
+class SaveNotesRequest(RequestModel):
     transcript_id: str
     summary_id: str
     user_notes: Optional[str] = ""
@@ -0,0 +1,20 @@
+from functools import lru_cache
+
+import ctranslate2
+from faster_whisper import WhisperModel
+
+
+def default_device():
+    """Pick (device, compute_type): FP16 on a CUDA GPU when one is present, INT8 on CPU otherwise."""
+    if ctranslate2.get_cuda_device_count() > 0:
+        return "cuda", "float16"
+    return "cpu", "int8"
+
+
+@lru_cache(maxsize=None)
+def get_whisper(name="medium", device=None, compute_type=None, cpu_threads=0):
+    """Load a faster-whisper (CTranslate2) model once per process and reuse it on every call."""
+    if device is None:
+        device, default_compute_type = default_device()
+        compute_type = compute_type or default_compute_type
+    return WhisperModel(name, device=device, compute_type=compute_type or "default", cpu_threads=cpu_threads)
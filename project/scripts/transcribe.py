@@ -1,19 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import whisper
 
-AUDIO = Path("audio_input/lecture.mp3")
-OUT = Path("raw_transcripts/lecture.txt")
+import numpy as np
+from faster_whisper import decode_audio
 
-OUT.parent.mkdir(parents=True, exist_ok=True)
+from project.backend.models.whisper_loader import default_device, get_whisper
 
-model = whisper.load_model("medium", device="cpu")
-result = model.transcribe(str(AUDIO))
+# Run from the repository root: python -m project.scripts.transcribe
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+AUDIO = PROJECT_DIR / "audio_input/lecture.mp3"
+OUT = PROJECT_DIR / "raw_transcripts/lecture.txt"
 
-with open(OUT, "w", encoding="utf-8") as f:
-    for s in result["segments"]:
-        f.write(
-            f"[{s['start']/60:.2f}-{s['end']/60:.2f} min] "
-            f"{s['text'].strip()}\n"
-        )
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 60
+# Look back this far from each chunk boundary for a quiet spot to cut at
+SEARCH_SECONDS = 5
+FRAME = SAMPLE_RATE // 100  # 10 ms
 
-print("Lecture transcript saved.")
+DEVICE, COMPUTE_TYPE = default_device()
+
+# A single GPU is shared by one process; on CPU, split the cores across workers
+WORKERS = 1 if DEVICE == "cuda" else max(1, (os.cpu_count() or 2) // 2)
+THREADS_PER_WORKER = max(1, (os.cpu_count() or 2) // WORKERS)
+
+
+def split_audio(audio):
+    """Cut audio into ~CHUNK_SECONDS pieces at the quietest 10 ms frame near each boundary."""
+    target = CHUNK_SECONDS * SAMPLE_RATE
+    search = SEARCH_SECONDS * SAMPLE_RATE
+    chunks = []
+    start = 0
+
+    while len(audio) - start > target:
+        window_start = start + target - search
+        frames = audio[window_start:start + target].reshape(-1, FRAME)
+        cut = window_start + int(np.argmin((frames ** 2).mean(axis=1))) * FRAME
+        chunks.append((start / SAMPLE_RATE, audio[start:cut]))
+        start = cut
+
+    chunks.append((start / SAMPLE_RATE, audio[start:]))
+    return chunks
+
+
+def transcribe_chunk(job):
+    """Transcribe one chunk in a worker process; timestamps are shifted back to the full recording."""
+    offset, chunk = job
+    model = get_whisper("medium", device=DEVICE, compute_type=COMPUTE_TYPE, cpu_threads=THREADS_PER_WORKER)
+    segments, _ = model.transcribe(chunk, beam_size=5, vad_filter=True)
+    return [(offset + s.start, offset + s.end, s.text.strip()) for s in segments]
+
+
+def main():
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+
+    chunks = split_audio(decode_audio(str(AUDIO), sampling_rate=SAMPLE_RATE))
+
+    if WORKERS == 1:
+        results = [transcribe_chunk(job) for job in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+            results = list(pool.map(transcribe_chunk, chunks))
+
+    lines = [
+        f"[{start/60:.2f}-{end/60:.2f} min] {text}\n"
+        for segments in results
+        for start, end, text in segments
+    ]
+    with open(OUT, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    print("Lecture transcript saved.")
+
+
+if __name__ == "__main__":
+    main()
@@ -44,13 +44,16 @@ echo "=================================================="
 echo ""
 echo "To start the application:"
 echo ""
-echo "1. Start the backend API:"
+echo "1. Start Redis and the transcription worker:"
+echo "   celery -A backend_api.celery_app worker"
+echo ""
+echo "2. In a new terminal, start the backend API:"
 echo "   python3 backend_api.py"
 echo ""
-echo "2. In a new terminal, start the frontend:"
+echo "3. In a new terminal, start the frontend:"
 echo "   streamlit run frontend_app.py"
 echo ""
-echo "3. Open your browser to:"
+echo "4. Open your browser to:"
 echo "   http://localhost:8501"
 echo ""
 echo "=================================================="